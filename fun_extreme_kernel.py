@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+
+# numba is optional: when it is not installed every kernel falls back to the pure numpy implementation
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+
+def _jit(function):
+    """
+    Compiles the kernel with numba in parallel mode if numba is installed, otherwise returns the function as is.
+    """
+    if NUMBA_AVAILABLE:
+        return numba.njit(parallel=True, cache=True)(function)
+    return function
+
+
+_prange = numba.prange if NUMBA_AVAILABLE else range
+
+# the number of days between 2 extremes is rounded down to whole days, as with pandas' Timedelta.days
+_NANOSECONDS_PER_DAY = 86400 * 10 ** 9
+
+
+@_jit
+def _find_local_extreme_numba(prices, window_in_days):
+    # monotonic deques of row numbers: the front is always the extreme of the current window [t-H, t+H]
+    number_of_dates, number_of_tickers = prices.shape
+    # outputs are written per ticker, so they are allocated ticker-major and returned transposed (column-major)
+    local_minimum = np.full((number_of_tickers, number_of_dates), np.nan)
+    local_maximum = np.full((number_of_tickers, number_of_dates), np.nan)
+    for j in _prange(number_of_tickers):
+        minimum_deque = np.empty(number_of_dates, dtype=np.int64)
+        maximum_deque = np.empty(number_of_dates, dtype=np.int64)
+        minimum_head, minimum_tail = 0, 0
+        maximum_head, maximum_tail = 0, 0
+        for s in range(number_of_dates + window_in_days):
+            if s < number_of_dates:
+                price = prices[s, j]
+                if price == price:
+                    while minimum_tail > minimum_head and prices[minimum_deque[minimum_tail - 1], j] >= price:
+                        minimum_tail -= 1
+                    minimum_deque[minimum_tail] = s
+                    minimum_tail += 1
+                    while maximum_tail > maximum_head and prices[maximum_deque[maximum_tail - 1], j] <= price:
+                        maximum_tail -= 1
+                    maximum_deque[maximum_tail] = s
+                    maximum_tail += 1
+            t = s - window_in_days
+            if t < 0:
+                continue
+            while minimum_tail > minimum_head and minimum_deque[minimum_head] < t - window_in_days:
+                minimum_head += 1
+            while maximum_tail > maximum_head and maximum_deque[maximum_head] < t - window_in_days:
+                maximum_head += 1
+            if minimum_tail > minimum_head:
+                local_minimum[j, t] = prices[minimum_deque[minimum_head], j]
+            if maximum_tail > maximum_head:
+                local_maximum[j, t] = prices[maximum_deque[maximum_head], j]
+    return local_minimum.T, local_maximum.T
+
+
+def _find_local_extreme_numpy(prices, window_in_days):
+    # reference implementation, O(dates x window): fmin/fmax skip the missing values, just like the row-wise min/max
+    # over the historical window
+    local_minimum = prices.copy()
+    local_maximum = prices.copy()
+    for i in range(1, window_in_days + 1):
+        local_minimum[i:] = np.fmin(local_minimum[i:], prices[:-i])
+        local_minimum[:-i] = np.fmin(local_minimum[:-i], prices[i:])
+        local_maximum[i:] = np.fmax(local_maximum[i:], prices[:-i])
+        local_maximum[:-i] = np.fmax(local_maximum[:-i], prices[i:])
+    return local_minimum, local_maximum
+
+
+@_jit
+def _calculate_extreme_return_numba(prices, is_local_minimum, is_local_maximum, dates_in_nanoseconds):
+    number_of_dates, number_of_tickers = prices.shape
+    is_not_duplicate = np.zeros((number_of_tickers, number_of_dates), dtype=np.bool_)
+    extreme_return = np.full((number_of_tickers, number_of_dates), np.nan)
+    number_of_days = np.full((number_of_tickers, number_of_dates), np.nan)
+    for j in _prange(number_of_tickers):
+        previous_extreme = -1
+        previous_unique_extreme = -1
+        for t in range(number_of_dates):
+            if not (is_local_minimum[t, j] or is_local_maximum[t, j]):
+                continue
+            if previous_extreme == -1 or is_local_minimum[t, j] != is_local_minimum[previous_extreme, j]:
+                is_not_duplicate[j, t] = True
+                if previous_unique_extreme != -1:
+                    extreme_return[j, t] = prices[t, j] / prices[previous_unique_extreme, j] - 1.0
+                    number_of_days[j, t] = (dates_in_nanoseconds[t] - dates_in_nanoseconds[previous_unique_extreme]) \
+                        // _NANOSECONDS_PER_DAY
+                previous_unique_extreme = t
+            previous_extreme = t
+    return is_not_duplicate.T, extreme_return.T, number_of_days.T
+
+
+def _locate_previous(is_flagged):
+    """
+    For every date, the row number of the last flagged date strictly before it, or -1 if there is none.
+    """
+    number_of_dates = is_flagged.shape[0]
+    row_number = np.where(is_flagged, np.arange(number_of_dates)[:, None], -1)
+    last_flagged = np.maximum.accumulate(row_number, axis=0)
+    previous_flagged = np.full(is_flagged.shape, -1)
+    previous_flagged[1:] = last_flagged[:-1]
+    return previous_flagged
+
+
+def _calculate_extreme_return_numpy(prices, is_local_minimum, is_local_maximum, dates_in_nanoseconds):
+    is_local_extreme = is_local_minimum | is_local_maximum
+
+    # keep only the first extreme of every run of local minimums (or local maximums)
+    previous_extreme = _locate_previous(is_local_extreme)
+    is_local_minimum_previous = np.take_along_axis(is_local_minimum, np.maximum(previous_extreme, 0), axis=0)
+    is_not_duplicate = is_local_extreme & ((previous_extreme == -1) | (is_local_minimum != is_local_minimum_previous))
+
+    # return and duration between 2 nearest unique extremes
+    previous_unique_extreme = _locate_previous(is_not_duplicate)
+    has_previous = is_not_duplicate & (previous_unique_extreme != -1)
+    previous_row = np.maximum(previous_unique_extreme, 0)
+    previous_price = np.take_along_axis(prices, previous_row, axis=0)
+    extreme_return = np.full(prices.shape, np.nan)
+    extreme_return[has_previous] = prices[has_previous] / previous_price[has_previous] - 1.0
+    number_of_days = np.full(prices.shape, np.nan)
+    elapsed_days = (dates_in_nanoseconds[:, None] - dates_in_nanoseconds[previous_row]) // _NANOSECONDS_PER_DAY
+    number_of_days[has_previous] = elapsed_days[has_previous]
+    return is_not_duplicate, extreme_return, number_of_days
+
+
+def _select_backend(backend):
+    if backend == 'auto':
+        return 'numba' if NUMBA_AVAILABLE else 'numpy'
+    if backend == 'numba' and not NUMBA_AVAILABLE:
+        raise Exception("The numba backend is requested but numba is not installed. The run is aborted.")
+    if backend not in ('numba', 'numpy'):
+        raise Exception("The backend " + str(backend) + " is not one of 'auto', 'numba' or 'numpy'. The run is aborted.")
+    return backend
+
+
+def calculate_return_between_local_extremes(price_df, window_in_days, backend='auto'):
+    """
+    Multi-ticker version of :func:`local_extreme.find_local_minimum`, :func:`local_extreme.find_local_maximum` and
+    :func:`local_extreme.calculate_return_between_nearest_local_minimum_and_maximum`. The local extremes are the
+    minimum and maximum within the time interval [t-H, t+H], a run of consecutive local minimums (or maximums) only
+    keeps its first date, and the return and the number of days are measured from the previous unique extreme.
+
+    The kernels run on numba with the tickers processed in parallel when numba is installed, and on pure numpy
+    otherwise. Both backends give identical output (see test_fun_extreme_kernel.py).
+
+    :param price_df: the prices of interest, with one column per ticker and a datetime index with format 'yyyy-mm-dd'.
+    Missing prices (e.g. before the listing of a ticker) are ignored.
+    :param window_in_days: the 2-sided horizon length
+    :param backend: 'numba', 'numpy', or 'auto' to use numba whenever it is installed
+    :return: a dictionary with per ticker the unique extreme values and the return between 2 nearest extreme values.
+    """
+    number_of_dates = len(price_df)
+    if window_in_days < 0:
+        raise Exception("The length of window: " + str(window_in_days) + " is negative. The run is aborted.")
+    if window_in_days >= number_of_dates:
+        raise Exception(
+            "The number of dates is " + str(number_of_dates) + " which is not as long as the length of window: "
+            + str(window_in_days) + ". The run is aborted.")
+    backend = _select_backend(backend)
+
+    # column-major so that the prices of every ticker are contiguous in memory
+    prices = np.asfortranarray(price_df.to_numpy(dtype=np.float64))
+    dates = pd.to_datetime(price_df.index)
+    dates_in_nanoseconds = (dates - dates[0]).to_numpy().astype('timedelta64[ns]').astype(np.int64)
+
+    if backend == 'numba':
+        local_minimum, local_maximum = _find_local_extreme_numba(prices, window_in_days)
+    else:
+        local_minimum, local_maximum = _find_local_extreme_numpy(prices, window_in_days)
+    is_local_minimum = np.asfortranarray(prices == local_minimum)
+    is_local_maximum = np.asfortranarray(prices == local_maximum)
+    if backend == 'numba':
+        is_not_duplicate, extreme_return, number_of_days = _calculate_extreme_return_numba(
+            prices, is_local_minimum, is_local_maximum, dates_in_nanoseconds)
+    else:
+        is_not_duplicate, extreme_return, number_of_days = _calculate_extreme_return_numpy(
+            prices, is_local_minimum, is_local_maximum, dates_in_nanoseconds)
+
+    extreme_summaries = {}
+    for j, ticker in enumerate(price_df.columns):
+        rows = np.flatnonzero(is_not_duplicate[:, j])
+        extreme_summaries[ticker] = pd.DataFrame(
+            data={ticker: price_df[ticker].to_numpy()[rows],
+                  'local_minimum': local_minimum[rows, j],
+                  'local_maximum': local_maximum[rows, j],
+                  'is_local_minimum': is_local_minimum[rows, j],
+                  'is_local_maximum': is_local_maximum[rows, j],
+                  'extreme_return': extreme_return[rows, j],
+                  'number_of_days': number_of_days[rows, j],
+                  'extreme_return_type': np.where(is_local_maximum[rows, j], 'gain', 'loss').astype(object)},
+            index=price_df.index[rows])
+    return extreme_summaries
@@ -41,12 +41,12 @@ def obtain_historical_window(stock_price_history_close, window_in_days, price_ty
         for i in range(-window_in_days, window_in_days + 1):
             if i < 0:
                 column_name = 't-' + str(-i)
-                stock_price_window.loc[:, column_name] = np.NaN
+                stock_price_window.loc[:, column_name] = np.nan
                 stock_price_window.loc[stock_price_window.index[-i:number_of_dates], column_name] = \
                     stock_price_window.loc[stock_price_window.index[0:number_of_dates + i], 't'].tolist()
             elif i > 0:
                 column_name = 't+' + str(i)
-                stock_price_window.loc[:, column_name] = np.NaN
+                stock_price_window.loc[:, column_name] = np.nan
                 stock_price_window.loc[stock_price_window.index[0:number_of_dates - i], column_name] = \
                     stock_price_window.loc[stock_price_window.index[i:number_of_dates], 't'].tolist()
     else:
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import fun_extreme_kernel
+import local_extreme
+
+
+def build_price_df():
+    """
+    Random walk prices for several tickers, rounded so that flat runs occur, with leading and interior missing prices
+    and a ticker without any price.
+    """
+    rng = np.random.default_rng(26)
+    dates = pd.date_range('2020-01-01', periods=400, freq='B', tz='UTC')
+    prices = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(dates), 4)), axis=0)) * 2) / 2
+    price_df = pd.DataFrame(data=prices, index=dates, columns=['A', 'B', 'C', 'D'])
+    price_df['E'] = np.nan
+    price_df.iloc[100:120, 0] = 95.0
+    price_df.iloc[:50, 1] = np.nan
+    price_df.iloc[200:210, 2] = np.nan
+    price_df.iloc[300:305, 3] = np.nan
+    return price_df
+
+
+@pytest.mark.parametrize('window_in_days', [0, 1, 3, 10])
+def test_numba_and_numpy_backends_are_identical(window_in_days):
+    pytest.importorskip('numba')
+    price_df = build_price_df()
+    numba_summaries = fun_extreme_kernel.calculate_return_between_local_extremes(price_df, window_in_days,
+                                                                                  backend='numba')
+    numpy_summaries = fun_extreme_kernel.calculate_return_between_local_extremes(price_df, window_in_days,
+                                                                                  backend='numpy')
+    for ticker in price_df.columns:
+        pd.testing.assert_frame_equal(numba_summaries[ticker], numpy_summaries[ticker])
+
+
+@pytest.mark.parametrize('window_in_days', [0, 1, 3, 10])
+def test_numpy_backend_matches_local_extreme(window_in_days):
+    price_type = 'Price'
+    price_df = build_price_df()
+    extreme_summaries = fun_extreme_kernel.calculate_return_between_local_extremes(price_df, window_in_days,
+                                                                                   backend='numpy')
+    # local_extreme cannot handle a ticker without any price, that case is covered separately below
+    for ticker in price_df.columns[price_df.notna().any()]:
+        ticker_price = price_df[[ticker]].rename(columns={ticker: price_type})
+        local_minimum = local_extreme.find_local_minimum(ticker_price, window_in_days, price_type)
+        local_maximum = local_extreme.find_local_maximum(ticker_price, window_in_days, price_type)
+        expected_summary = local_extreme.calculate_return_between_nearest_local_minimum_and_maximum(
+            ticker_price, local_minimum, local_maximum, price_type)
+        extreme_summary = extreme_summaries[ticker].rename(columns={ticker: price_type})
+        pd.testing.assert_frame_equal(extreme_summary, expected_summary[extreme_summary.columns], check_freq=False)
+
+
+@pytest.mark.parametrize('backend', ['numba', 'numpy'])
+def test_ticker_without_prices_gives_empty_summary(backend):
+    if backend == 'numba':
+        pytest.importorskip('numba')
+    price_df = build_price_df()
+    extreme_summary = fun_extreme_kernel.calculate_return_between_local_extremes(price_df, 3, backend=backend)['E']
+    assert extreme_summary.empty
+    assert 'extreme_return_type' in extreme_summary.columns
+
+
+def test_negative_window_is_rejected():
+    with pytest.raises(Exception, match='negative'):
+        fun_extreme_kernel.calculate_return_between_local_extremes(build_price_df(), -2, backend='numpy')